@@ -1,7 +1,11 @@
 #!/usr/bin/env python3
 import sys
 import argparse
-import struct
+import os
+from collections import deque
+
+MIN_CHUNK_SIZE = 1 << 20
+MAX_CHUNK_SIZE = 32 << 20
 
 
 class UVMAssembler:
@@ -84,22 +88,44 @@ class UVMAssembler:
             byte3 = 0
             return bytes([byte1, byte2, byte3])
 
-    def generate_binary(self, output_file, test_mode=False):
-        binary_data = b''
+    def to_bytes(self, test_mode=False):
+        chunks = []
 
         for instr in self.instructions:
             binary_instr = self.encode_instruction(instr)
-            binary_data += binary_instr
+            chunks.append(binary_instr)
 
             if test_mode:
                 hex_repr = ', '.join([f'0x{byte:02X}' for byte in binary_instr])
                 print(f"{instr['mnemonic']} {instr['operand']}: {hex_repr}")
 
+        return b''.join(chunks)
+
+    def generate_binary(self, output_file, test_mode=False):
+        binary_data = self.to_bytes(test_mode)
+
         with open(output_file, 'wb') as f:
             f.write(binary_data)
 
         return binary_data
 
+    def assemble_file_parallel(self, input_file, output_file, workers=None):
+        from concurrent.futures import ProcessPoolExecutor
+
+        workers = workers or os.cpu_count() or 1
+        chunks = split_source_file(input_file, workers * 4)
+
+        # Небольшой файл (один фрагмент) ассемблируется без запуска процессов
+        if len(chunks) == 1 or workers == 1:
+            return write_chunks(map(assemble_chunk, chunks), output_file)
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            try:
+                return write_chunks(ordered_results(pool, chunks, workers * 2), output_file)
+            except Exception:
+                pool.shutdown(cancel_futures=True)
+                raise
+
     def display_intermediate(self):
         print("Промежуточное представление:")
         print("A\tB\tМнемоника")
@@ -112,15 +138,112 @@ class UVMAssembler:
             print(f"{a}\t{b}\t{mnemonic}")
 
 
+def split_source_file(input_file, chunk_count):
+    # Разбиение файла на фрагменты по границам строк
+    size = os.path.getsize(input_file)
+    chunk_size = min(MAX_CHUNK_SIZE, max(MIN_CHUNK_SIZE, size // max(chunk_count, 1) + 1))
+
+    chunks = []
+    start = 0
+    with open(input_file, 'rb') as f:
+        while start < size:
+            f.seek(min(start + chunk_size, size))
+            f.readline()
+            end = min(f.tell(), size)
+            chunks.append((input_file, start, end))
+            start = end
+
+    return chunks or [(input_file, 0, 0)]
+
+
+def ordered_results(pool, chunks, in_flight):
+    # Результаты выдаются по порядку фрагментов; в работе не больше in_flight фрагментов,
+    # поэтому готовые, но еще не записанные байты не накапливаются в памяти
+    pending = deque()
+    for chunk in chunks:
+        pending.append(pool.submit(assemble_chunk, chunk))
+        if len(pending) >= in_flight:
+            yield pending.popleft().result()
+
+    while pending:
+        yield pending.popleft().result()
+
+
+def write_chunks(results, output_file):
+    line_offset = 0
+    instructions_count = 0
+
+    # Результат пишется во временный файл рядом с выходным и заменяет его только
+    # при успехе: ошибка в исходнике не портит ранее собранный файл
+    temp_file = output_file + '.tmp'
+    try:
+        with open(temp_file, 'wb') as out:
+            for binary_data, error_line, error, newlines in results:
+                if error is not None:
+                    raise ValueError(f"Ошибка в строке {line_offset + error_line}: {error}")
+
+                out.write(binary_data)
+                instructions_count += len(binary_data) // 3
+                line_offset += newlines
+
+        os.replace(temp_file, output_file)
+    except BaseException:
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
+        raise
+
+    return instructions_count
+
+
+def assemble_chunk(chunk):
+    input_file, start, end = chunk
+
+    assembler = UVMAssembler()
+    encoded = bytearray()
+    line_num = 0
+    newlines = 0
+
+    # Фрагмент читается построчно, в памяти только закодированные байты
+    with open(input_file, 'rb') as f:
+        f.seek(start)
+        position = start
+        while position < end:
+            line = f.readline()
+            position += len(line)
+            line_num += 1
+            newlines += line.endswith(b'\n')
+
+            try:
+                instruction = assembler.parse_line(line.decode('utf-8'))
+            except Exception as e:
+                return b'', line_num, str(e), newlines
+
+            if instruction:
+                encoded += assembler.encode_instruction(instruction)
+
+    return encoded, None, None, newlines
+
+
 def main():
     parser = argparse.ArgumentParser(description='Ассемблер УВМ')
     parser.add_argument('input_file', help='Путь к исходному файлу')
     parser.add_argument('output_file', help='Путь к двоичному файлу-результату')
     parser.add_argument('--test', action='store_true', help='Режим тестирования')
+    parser.add_argument('--jobs', type=int, nargs='?', const=0,
+                        help='Параллельное ассемблирование фрагментами (0 - по числу ядер)')
 
     args = parser.parse_args()
 
+    if args.jobs is not None and args.test:
+        parser.error("--jobs несовместим с --test")
+
     try:
+        if args.jobs is not None:
+            assembler = UVMAssembler()
+            count = assembler.assemble_file_parallel(args.input_file, args.output_file, args.jobs or None)
+            print(f"\nУспешно ассемблировано {count} команд")
+            return
+
         with open(args.input_file, 'r', encoding='utf-8') as f:
             source_code = f.read()
 
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from interpreter import UVMInterpreter
+
+# Символьные значения сегмента: (вид, аргумент, применен ли SGN)
+CONST = 0  # константа
+MEMORY = 1  # значение ячейки на входе сегмента
+STACK = 2  # входной слот стека (0 - вершина)
+
+
+def _sign(value):
+    if value > 0:
+        return 1
+    elif value < 0:
+        return -1
+    return 0
+
+
+def summarize_segment(segment):
+    # Передаточная функция сегмента: записанные ячейки и остаток стека выражены через
+    # память и стек на входе сегмента, поэтому сегменты обрабатываются независимо
+    raw, memory_size = segment
+    writes = {}
+    stack = []
+    consumed = 0
+    underflows = []
+    error = None
+
+    for position in range(0, len(raw), 3):
+        byte1 = raw[position]
+        opcode = byte1 & 0x0F
+
+        if opcode == 14:  # LOAD_CONST
+            operand = ((byte1 & 0xF0) >> 4) | (raw[position + 1] << 4) | (raw[position + 2] << 12)
+            if operand & 0x4000:
+                operand -= 0x8000
+            stack.append((CONST, operand, False))
+            continue
+
+        if opcode != 11 and opcode != 7 and opcode != 4:
+            error = (position // 3, f"Неизвестный код операции: {opcode}")
+            break
+
+        operand = ((byte1 & 0xF0) >> 4) | (raw[position + 1] << 4)
+        if operand >= memory_size:
+            error = (position // 3, f"Адрес памяти {operand} вне диапазона")
+            break
+
+        if opcode == 7:  # WRITE_MEM
+            if stack:
+                writes[operand] = stack.pop()
+            else:
+                # underflows[k] - шаг, на котором сегменту нужен (k+1)-й слот входного стека
+                underflows.append(position // 3)
+                writes[operand] = (STACK, consumed, False)
+                consumed += 1
+            continue
+
+        value = writes.get(operand, (MEMORY, operand, False))
+        if opcode == 4:  # SGN
+            kind, argument, _ = value
+            value = (CONST, _sign(argument), False) if kind == CONST else (kind, argument, True)
+        stack.append(value)
+
+    return writes, consumed, stack, underflows, error
+
+
+def _resolve(value, memory, stack):
+    kind, argument, signed = value
+    if kind == CONST:
+        return argument
+    result = memory[argument] if kind == MEMORY else stack[-1 - argument]
+    return _sign(result) if signed else result
+
+
+class DataflowExecutor:
+    def __init__(self, interpreter=None, workers=None, min_parallel_steps=100000, segments_per_worker=4):
+        self.interpreter = interpreter or UVMInterpreter()
+        self.workers = workers or os.cpu_count() or 1
+        self.min_parallel_steps = min_parallel_steps
+        self.segments_per_worker = segments_per_worker
+
+    def segments(self, limit):
+        # Сегменты передаются процессам сырыми байтами, декодирование выполняется в процессах
+        raw = b''.join(self.interpreter.code_memory[:limit])
+        count = 1 if limit < self.min_parallel_steps else self.workers * self.segments_per_worker
+        size = max(1, -(-limit // count))
+
+        memory_size = len(self.interpreter.data_memory)
+        starts = list(range(0, limit, size))
+        return starts, [(raw[start * 3:(start + size) * 3], memory_size) for start in starts]
+
+    def summarize(self, segments):
+        if len(segments) > 1 and self.workers > 1:
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                return list(pool.map(summarize_segment, segments))
+        return [summarize_segment(segment) for segment in segments]
+
+    def compute(self, max_steps=1000):
+        # Последовательная часть - композиция сводок по порядку, O(сегментов * записанных ячеек)
+        interpreter = self.interpreter
+        limit = min(len(interpreter.code_memory), max_steps)
+        starts, segments = self.segments(limit)
+        memory = interpreter.data_memory
+
+        for start, summary in zip(starts, self.summarize(segments)):
+            writes, consumed, pushed, underflows, error = summary
+            stack = interpreter.stack
+
+            failures = [error] if error else []
+            if consumed > len(stack):
+                failures.append((underflows[len(stack)], "Стек пуст для операции WRITE_MEM"))
+            if failures:
+                index, message = min(failures)
+                return self.fail(start, start + index, message)
+
+            values = {addr: _resolve(value, memory, stack) for addr, value in writes.items()}
+            remaining = [_resolve(value, memory, stack) for value in pushed]
+
+            for addr, value in values.items():
+                memory[addr] = value
+            del stack[len(stack) - consumed:]
+            stack.extend(remaining)
+
+        interpreter.pc = limit
+        return limit, None
+
+    def fail(self, start, index, message):
+        # Состояние на момент ошибки: начало сегмента до сбойного шага выполняется обычным путем
+        interpreter = self.interpreter
+        interpreter.pc = start
+        while interpreter.pc < index:
+            instruction = interpreter.decode_instruction(interpreter.code_memory[interpreter.pc])
+            interpreter.execute_instruction(instruction, verbose=False)
+            interpreter.pc += 1
+        return index, (index, message)
+
+    def execute(self, memory_dump_file, dump_range=None, max_steps=1000, digest_file=None):
+        print("=" * 50)
+        print(f"ЗАПУСК ИНТЕРПРЕТАТОРА УВМ (параллельно, процессов: {self.workers})")
+        print("=" * 50)
+
+        step, error = self.compute(max_steps)
+
+        if error:
+            index, message = error
+            print(f"\nОШИБКА ВЫПОЛНЕНИЯ на шаге {index}, PC={index}: {message}")
+            return False
+
+        if step >= max_steps:
+            print(f"\nПРЕДУПРЕЖДЕНИЕ: Достигнут лимит {max_steps} шагов")
+        else:
+            print(f"\nПрограмма завершена успешно")
+
+        print(f"Выполнено шагов: {step}")
+
+        if memory_dump_file:
+            self.interpreter.dump_memory(memory_dump_file, dump_range)
+        if digest_file:
+            self.interpreter.save_digest(digest_file)
+        return True
+
+    def load_bytes(self, program_data):
+        return self.interpreter.load_bytes(program_data)
+
+    def run(self, binary_file, memory_dump_file, dump_range=None, max_steps=1000, digest_file=None):
+        self.interpreter.load_program(binary_file)
+        return self.execute(memory_dump_file, dump_range, max_steps, digest_file)
@@ -1,17 +1,51 @@
 #!/usr/bin/env python3
 import sys
 import argparse
-import csv
 import os
+import copy
+import bisect
+
+from paged_memory import PagedMemory, memory_is_clean
 
 
 class UVMInterpreter:
-    def __init__(self, memory_size=2048):
+    def __init__(self, memory_size=2048, tracer=None, prefix_cache=None):
         self.data_memory = [0] * memory_size
         self.code_memory = []
         self.stack = []
         self.pc = 0
         self.halted = False
+        self.tracer = tracer
+        self.prefix_cache = prefix_cache
+        self.digest_page_size = None
+        self.breakpoints = set()
+        self.watchpoints = set()
+        self.stack_conditions = set()
+        self._decoded = []
+        self._stops = {}
+        self._stop_positions = []
+        self._stops_stale = True
+        self._debugging = False
+
+    def snapshot_memory(self):
+        # Постраничная память включается только при первом ветвлении,
+        # интерпретаторы без fork() работают с обычным списком
+        if not isinstance(self.data_memory, PagedMemory):
+            self.data_memory = PagedMemory.from_list(self.data_memory)
+        return self.data_memory.fork()
+
+    def fork(self):
+        # Дешевое ветвление: страницы памяти общие до первой записи в любой из копий
+        clone = copy.copy(self)
+        clone.data_memory = self.snapshot_memory()
+        clone.stack = list(self.stack)
+        clone.breakpoints = set(self.breakpoints)
+        clone.watchpoints = set(self.watchpoints)
+        clone.stack_conditions = set(self.stack_conditions)
+        clone._debugging = False
+        clone.tracer = None
+        clone.prefix_cache = None
+        return clone
 
     def load_program(self, binary_file):
         if not os.path.exists(binary_file):
@@ -20,6 +54,9 @@ class UVMInterpreter:
         with open(binary_file, 'rb') as f:
             program_data = f.read()
 
+        return self.load_bytes(program_data)
+
+    def load_bytes(self, program_data):
         self.code_memory = []
         for i in range(0, len(program_data), 3):
             instruction_bytes = program_data[i:i + 3]
@@ -29,6 +66,7 @@ class UVMInterpreter:
                 instruction_bytes += b'\x00' * (3 - len(instruction_bytes))
                 self.code_memory.append(instruction_bytes)
 
+        self._stops_stale = True
         print(f"Загружено {len(self.code_memory)} инструкций")
         return len(self.code_memory)
 
@@ -69,12 +107,15 @@ class UVMInterpreter:
             'bytes': instruction_bytes
         }
 
-    def execute_instruction(self, instruction):
+    def execute_instruction(self, instruction, verbose=True):
         opcode = instruction['opcode']
         operand = instruction['operand']
         mnemonic = instruction['mnemonic']
+        address = -1
+        old_value = 0
 
-        print(f"[PC:{self.pc:03d}] {mnemonic} {operand:4d} | Стек: {self.stack}")
+        if verbose:
+            print(f"[PC:{self.pc:03d}] {mnemonic} {operand:4d} | Стек: {self.stack}")
 
         if opcode == 14:  # LOAD_CONST
             self.stack.append(operand)
@@ -91,6 +132,8 @@ class UVMInterpreter:
             if not self.stack:
                 raise ValueError("Стек пуст для операции WRITE_MEM")
             value = self.stack.pop()
+            address = operand
+            old_value = self.data_memory[operand]
             self.data_memory[operand] = value
 
         elif opcode == 4:  # SGN
@@ -108,15 +151,154 @@ class UVMInterpreter:
 
             self.stack.append(result)
 
-    def run(self, binary_file, memory_dump_file, dump_range=None, max_steps=1000):
-        instructions_count = self.load_program(binary_file)
+        if self.tracer:
+            self.tracer.record(self.pc, opcode, operand, address, old_value)
+
+    def add_breakpoint(self, pc):
+        self.breakpoints.add(pc)
+        self._stops_stale = True
+
+    def add_watchpoint(self, address):
+        self.watchpoints.add(address)
+        self._stops_stale = True
+
+    def add_stack_condition(self, depth):
+        self.stack_conditions.add(depth)
+        self._stops_stale = True
+
+    def clear_breakpoints(self):
+        self.breakpoints.clear()
+        self.watchpoints.clear()
+        self.stack_conditions.clear()
+        self._stops_stale = True
+
+    def scan_stops(self):
+        # Программа линейна: точки остановки вычисляются заранее по декодированному коду.
+        # Позиция остановки - значение PC перед выполнением следующей команды.
+        self._decoded = []
+        self._stops = {}
+        self._stops_stale = False
+
+        for instruction_bytes in self.code_memory:
+            try:
+                self._decoded.append(self.decode_instruction(instruction_bytes))
+            except ValueError:
+                break
+
+        # Глубина стека в начале программы восстанавливается по уже выполненной части
+        executed = self._decoded[:self.pc]
+        writes = sum(1 for instruction in executed if instruction['opcode'] == 7)
+        depth = len(self.stack) - (len(executed) - writes) + writes
+
+        for pc, instruction in enumerate(self._decoded):
+            if pc in self.breakpoints:
+                self._stops.setdefault(pc, []).append(f"точка останова PC={pc}")
+
+            if instruction['opcode'] == 7:
+                depth -= 1
+                if instruction['operand'] in self.watchpoints:
+                    self._stops.setdefault(pc + 1, []).append(
+                        f"запись в ячейку {instruction['operand']} (PC={pc})")
+            else:
+                depth += 1
+
+            if depth in self.stack_conditions:
+                self._stops.setdefault(pc + 1, []).append(f"глубина стека {depth} (PC={pc})")
+
+        self._stop_positions = sorted(self._stops)
+
+    def debug_start(self):
+        # Новый сеанс отладки начинается с чистого состояния и пересканированных остановок
+        self._end_debug()
+        self.pc = 0
+        self.halted = False
+        self.stack = []
+        self.data_memory = [0] * len(self.data_memory)
+        self._stops_stale = True
+        self._begin_debug()
+        return self._stops.get(0)
+
+    def _begin_debug(self):
+        # Точки, добавленные после начала отладки, учитываются пересканированием при следующем шаге
+        if self._stops_stale:
+            self.scan_stops()
+        if not self._debugging:
+            self._debugging = True
+            if self.tracer:
+                self.tracer.start(self)
+
+    def _end_debug(self):
+        if self._debugging:
+            self._debugging = False
+            if self.tracer:
+                self.tracer.finish()
+
+    def _debug_execute(self, verbose):
+        if self.pc < len(self._decoded):
+            instruction = self._decoded[self.pc]
+        else:
+            instruction = self.decode_instruction(self.code_memory[self.pc])
+        self.execute_instruction(instruction, verbose)
+        self.pc += 1
+
+    def debug_continue(self, max_steps=None):
+        self._begin_debug()
+
+        # Быстрый путь: команды до следующей остановки выполняются без вывода и проверок
+        index = bisect.bisect_right(self._stop_positions, self.pc)
+        stop = self._stop_positions[index] if index < len(self._stop_positions) else len(self.code_memory)
+        if max_steps is not None:
+            stop = min(stop, self.pc + max_steps)
+
+        try:
+            while self.pc < stop:
+                self._debug_execute(verbose=False)
+        except Exception:
+            self._end_debug()
+            raise
+
+        if self.debug_finished():
+            self._end_debug()
+        return self._stops.get(self.pc)
+
+    def debug_step(self):
+        if self.debug_finished():
+            return None
 
+        self._begin_debug()
+        try:
+            self._debug_execute(verbose=True)
+        except Exception:
+            self._end_debug()
+            raise
+
+        if self.debug_finished():
+            self._end_debug()
+        return self._stops.get(self.pc)
+
+    def debug_finished(self):
+        return self.pc >= len(self.code_memory)
+
+    def run(self, binary_file, memory_dump_file, dump_range=None, max_steps=1000, digest_file=None):
+        self.load_program(binary_file)
+        return self.execute(memory_dump_file, dump_range, max_steps, digest_file)
+
+    def execute(self, memory_dump_file, dump_range=None, max_steps=1000, digest_file=None):
         print("=" * 50)
         print("ЗАПУСК ИНТЕРПРЕТАТОРА УВМ")
         print("=" * 50)
 
         step = 0
         self.pc = 0
+        cache_keys = None
+
+        if self.tracer:
+            self.tracer.start(self)
+        elif self.prefix_cache is not None and not self.stack and memory_is_clean(self.data_memory):
+            # Общий префикс программы восстанавливается из кэша вместо повторного выполнения
+            step, cache_keys = self.prefix_cache.restore(self, max_steps)
+            if step:
+                print(f"Префикс из кэша: {step} шагов")
 
         try:
             while self.pc < len(self.code_memory) and step < max_steps and not self.halted:
@@ -126,6 +308,10 @@ class UVMInterpreter:
                 self.pc += 1
                 step += 1
 
+                if cache_keys and step in cache_keys:
+                    key, shared = cache_keys[step]
+                    self.prefix_cache.store(key, self, shared)
+
             if step >= max_steps:
                 print(f"\nПРЕДУПРЕЖДЕНИЕ: Достигнут лимит {max_steps} шагов")
             elif self.halted:
@@ -134,15 +320,40 @@ class UVMInterpreter:
                 print(f"\nПрограмма завершена успешно")
 
             print(f"Выполнено шагов: {step}")
+            if cache_keys is not None:
+                self.prefix_cache.report()
 
         except Exception as e:
             print(f"\nОШИБКА ВЫПОЛНЕНИЯ на шаге {step}, PC={self.pc}: {e}")
             return False
 
-        self.dump_memory(memory_dump_file, dump_range)
+        finally:
+            if self.tracer:
+                self.tracer.finish()
+
+        if memory_dump_file:
+            self.dump_memory(memory_dump_file, dump_range)
+        if digest_file:
+            self.save_digest(digest_file)
         return True
 
+    def save_digest(self, filename, page_size=None):
+        import memory_digest
+
+        if page_size is None:
+            page_size = self.digest_page_size
+        if page_size is None:
+            page_size = memory_digest.DEFAULT_PAGE_SIZE
+        tree = memory_digest.build_tree(self.data_memory, page_size)
+        memory_digest.save_digest(tree, filename)
+
+        print(f"Дайджест памяти сохранен в {filename}")
+        print(f"Корневой хэш: {memory_digest.root_digest(tree)}")
+        return tree
+
     def dump_memory(self, filename, dump_range=None):
+        import csv
+
         if dump_range:
             start, end = dump_range
         else:
@@ -188,20 +399,39 @@ def parse_range(range_str):
         raise ValueError("Неверный формат диапазона. Используйте: start-end или address")
 
 
+def positive_int(value):
+    number = int(value)
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"ожидается положительное число: {value}")
+    return number
+
+
 def main():
     parser = argparse.ArgumentParser(description='Интерпретатор УВМ')
     parser.add_argument('binary_file', help='Путь к бинарному файлу с программой')
-    parser.add_argument('memory_dump', help='Путь к файлу для дампа памяти')
+    parser.add_argument('memory_dump', nargs='?', help='Путь к файлу для дампа памяти')
     parser.add_argument('--range', help='Диапазон адресов для дампа (формат: start-end или address)')
     parser.add_argument('--max-steps', type=int, default=1000, help='Максимальное количество шагов выполнения')
+    parser.add_argument('--digest', help='Путь к файлу для дайджеста памяти (хэш-дерево по страницам)')
+    parser.add_argument('--digest-page-size', type=positive_int, help='Размер страницы дайджеста в ячейках (по умолчанию 64)')
+    parser.add_argument('--trace', help='Путь к файлу для бинарной трассы выполнения')
 
     args = parser.parse_args()
 
+    if not args.memory_dump and not args.digest:
+        parser.error("укажите файл дампа памяти и/или --digest")
+
     try:
         dump_range = parse_range(args.range)
 
-        interpreter = UVMInterpreter()
-        success = interpreter.run(args.binary_file, args.memory_dump, dump_range, args.max_steps)
+        tracer = None
+        if args.trace:
+            from uvm_trace import TraceRecorder
+            tracer = TraceRecorder(args.trace)
+
+        interpreter = UVMInterpreter(tracer=tracer)
+        interpreter.digest_page_size = args.digest_page_size
+        success = interpreter.run(args.binary_file, args.memory_dump, dump_range, args.max_steps, args.digest)
 
         if not success:
             sys.exit(1)
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+import sys
+import argparse
+import hashlib
+import json
+import struct
+
+from paged_memory import DEFAULT_PAGE_SIZE, memory_pages
+
+
+def _hash(data):
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+def page_hashes(memory, page_size=DEFAULT_PAGE_SIZE):
+    if page_size <= 0:
+        raise ValueError("Размер страницы должен быть положительным")
+
+    return [_hash(struct.pack(f'<{len(page)}q', *page)) for page in memory_pages(memory, page_size)]
+
+
+def build_tree(memory, page_size=DEFAULT_PAGE_SIZE):
+    # Уровни дерева снизу вверх: levels[0] - хэши страниц, levels[-1] - корень
+    level = page_hashes(memory, page_size) or [_hash(b'')]
+    levels = [level]
+
+    while len(level) > 1:
+        parents = []
+        for i in range(0, len(level), 2):
+            parents.append(_hash(b''.join(level[i:i + 2])))
+        level = parents
+        levels.append(level)
+
+    return {
+        'page_size': page_size,
+        'memory_size': len(memory),
+        'levels': levels
+    }
+
+
+def root_digest(tree):
+    return tree['levels'][-1][0].hex()
+
+
+def save_digest(tree, filename):
+    data = {
+        'page_size': tree['page_size'],
+        'memory_size': tree['memory_size'],
+        'root': root_digest(tree),
+        'levels': [[h.hex() for h in level] for level in tree['levels']]
+    }
+
+    with open(filename, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+
+
+def load_digest(filename):
+    with open(filename, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    return {
+        'page_size': data['page_size'],
+        'memory_size': data['memory_size'],
+        'levels': [[bytes.fromhex(h) for h in level] for level in data['levels']]
+    }
+
+
+def diff_trees(tree_a, tree_b):
+    if tree_a['page_size'] != tree_b['page_size']:
+        raise ValueError("Дайджесты построены с разным размером страницы")
+    if tree_a['memory_size'] != tree_b['memory_size']:
+        raise ValueError("Дайджесты построены для разного размера памяти")
+
+    levels_a = tree_a['levels']
+    levels_b = tree_b['levels']
+
+    # Спуск от корня только в различающиеся поддеревья
+    candidates = [0]
+    for depth in range(len(levels_a) - 1, -1, -1):
+        level_a = levels_a[depth]
+        level_b = levels_b[depth]
+        differing = [i for i in candidates if level_a[i] != level_b[i]]
+
+        if depth == 0:
+            return differing
+
+        candidates = []
+        child_count = len(levels_a[depth - 1])
+        for i in differing:
+            candidates.extend(c for c in (2 * i, 2 * i + 1) if c < child_count)
+
+    return []
+
+
+def diff_memory(memory, golden_tree):
+    # Сравнение памяти с эталонным дайджестом: адреса внутри различающихся страниц
+    tree = build_tree(memory, golden_tree['page_size'])
+    page_size = golden_tree['page_size']
+    return [(page * page_size, min((page + 1) * page_size, len(memory)))
+            for page in diff_trees(tree, golden_tree)]
+
+
+def diff_cells(memory_a, memory_b, page_size=DEFAULT_PAGE_SIZE):
+    if len(memory_a) != len(memory_b):
+        raise ValueError("Размеры памяти не совпадают")
+
+    pages = diff_trees(build_tree(memory_a, page_size), build_tree(memory_b, page_size))
+
+    differences = []
+    for page in pages:
+        for addr in range(page * page_size, min((page + 1) * page_size, len(memory_a))):
+            if memory_a[addr] != memory_b[addr]:
+                differences.append((addr, memory_a[addr], memory_b[addr]))
+    return differences
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Сравнение дайджестов памяти УВМ')
+    parser.add_argument('digest_a', help='Путь к дайджесту первого запуска')
+    parser.add_argument('digest_b', help='Путь к дайджесту второго запуска или эталону')
+
+    args = parser.parse_args()
+
+    try:
+        tree_a = load_digest(args.digest_a)
+        tree_b = load_digest(args.digest_b)
+
+        pages = diff_trees(tree_a, tree_b)
+        if not pages:
+            print(f"Дайджесты совпадают: {root_digest(tree_a)}")
+            return
+
+        page_size = tree_a['page_size']
+        print(f"Различающихся страниц: {len(pages)}")
+        for page in pages:
+            start = page * page_size
+            end = min(start + page_size, tree_a['memory_size']) - 1
+            print(f"Страница {page}: адреса {start}-{end}")
+        sys.exit(1)
+
+    except Exception as e:
+        print(f"Ошибка: {e}")
+        sys.exit(2)
+
+
+if __name__ == "__main__":
+    main()
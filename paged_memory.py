@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+from itertools import chain
+
+DEFAULT_PAGE_SIZE = 64
+
+
+class PagedMemory:
+    def __init__(self, size, page_size=DEFAULT_PAGE_SIZE):
+        if size < 0:
+            raise ValueError("Размер памяти не может быть отрицательным")
+        if page_size <= 0:
+            raise ValueError("Размер страницы должен быть положительным")
+
+        self.size = size
+        self.page_size = page_size
+        self.page_count = (size + page_size - 1) // page_size
+
+        # Хранятся только записанные страницы: общая база (не изменяется после fork)
+        # и собственные страницы этой копии. Отсутствующие страницы - нулевые.
+        self._zero_page = [0] * page_size
+        self._base = {}
+        self._overlay = {}
+
+    @classmethod
+    def from_list(cls, values, page_size=DEFAULT_PAGE_SIZE):
+        memory = cls(len(values), page_size)
+        for page in range(memory.page_count):
+            start = page * page_size
+            chunk = values[start:start + page_size]
+            if any(chunk):
+                memory._overlay[page] = chunk + [0] * (page_size - len(chunk))
+        return memory
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.to_list()[index]
+
+        if index < 0:
+            index += self.size
+        if index < 0 or index >= self.size:
+            raise IndexError("Адрес памяти вне диапазона")
+
+        page, offset = divmod(index, self.page_size)
+        data = self._overlay.get(page)
+        if data is None:
+            data = self._base.get(page, self._zero_page)
+        return data[offset]
+
+    def __setitem__(self, index, value):
+        if index < 0:
+            index += self.size
+        if index < 0 or index >= self.size:
+            raise IndexError("Адрес памяти вне диапазона")
+
+        page, offset = divmod(index, self.page_size)
+        data = self._overlay.get(page)
+        if data is None:
+            # Копирование при записи: общая страница копируется при первом изменении
+            data = list(self._base.get(page, self._zero_page))
+            self._overlay[page] = data
+        data[offset] = value
+
+    def iter_pages(self):
+        overlay = self._overlay
+        base = self._base
+        zero_page = self._zero_page
+
+        for page in range(self.page_count):
+            data = overlay.get(page)
+            if data is None:
+                data = base.get(page, zero_page)
+            if page == self.page_count - 1:
+                data = data[:self.size - page * self.page_size]
+            yield data
+
+    def __iter__(self):
+        return chain.from_iterable(self.iter_pages())
+
+    def __eq__(self, other):
+        try:
+            return len(self) == len(other) and self.to_list() == list(other)
+        except TypeError:
+            return NotImplemented
+
+    def __repr__(self):
+        return f"PagedMemory(size={self.size}, page_size={self.page_size}, owned={len(self._overlay)})"
+
+    def fork(self):
+        # Собственные страницы переносятся в новую общую базу; копия стоит O(записанных страниц),
+        # а повторное ветвление без новых записей - O(1)
+        if self._overlay:
+            base = dict(self._base)
+            base.update(self._overlay)
+            self._base = base
+            self._overlay = {}
+
+        child = PagedMemory.__new__(PagedMemory)
+        child.size = self.size
+        child.page_size = self.page_size
+        child.page_count = self.page_count
+        child._zero_page = self._zero_page
+        child._base = self._base
+        child._overlay = {}
+        return child
+
+    def is_clean(self):
+        return not any(any(data) for data in chain(self._base.values(), self._overlay.values()))
+
+    def owned_pages(self):
+        return len(self._overlay)
+
+    def to_list(self):
+        return list(self)
+
+
+def memory_pages(memory, page_size=DEFAULT_PAGE_SIZE):
+    # Постраничный доступ для обходящих всю память (дайджест, трасса) без поячеечной индексации
+    if isinstance(memory, PagedMemory):
+        if memory.page_size == page_size:
+            return memory.iter_pages()
+        memory = memory.to_list()
+
+    return (memory[start:start + page_size] for start in range(0, len(memory), page_size))
+
+
+def memory_is_clean(memory):
+    if isinstance(memory, PagedMemory):
+        return memory.is_clean()
+    return not any(memory)
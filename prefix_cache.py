@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+import hashlib
+from collections import OrderedDict
+
+
+class PrefixCache:
+    def __init__(self, capacity=256, interval=1024, history_size=None):
+        if capacity <= 0:
+            raise ValueError("Емкость кэша должна быть положительной")
+        if interval <= 0:
+            raise ValueError("Интервал сохранения должен быть положительным")
+
+        self.capacity = capacity
+        self.interval = interval
+        self.history_size = history_size or capacity * 256
+        # Начало OrderedDict - холодный конец LRU, конец - горячий
+        self._entries = OrderedDict()
+        # Ключи префиксов прошлых запусков без состояний: по ним находится точка расхождения
+        self._history = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.skipped_steps = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def prefix_keys(self, code_memory, memory_size, max_steps):
+        # Ключи префиксов на границах интервала: хэш размера памяти и байтов команд
+        hasher = hashlib.blake2b(memory_size.to_bytes(8, 'little'), digest_size=16)
+        keys = {}
+
+        limit = min(len(code_memory), max_steps)
+        for step in range(1, limit + 1):
+            hasher.update(code_memory[step - 1])
+            if step % self.interval == 0 or step == limit:
+                keys[step] = hasher.digest()
+
+        return keys
+
+    def restore(self, interpreter, max_steps):
+        keys = self.prefix_keys(interpreter.code_memory, len(interpreter.data_memory), max_steps)
+
+        # Точка расхождения - самый длинный префикс, уже встречавшийся в другой программе
+        shared_until = max((step for step, key in keys.items() if key in self._history), default=0)
+        for key in keys.values():
+            self._history[key] = None
+            self._history.move_to_end(key)
+        while len(self._history) > self.history_size:
+            self._history.popitem(last=False)
+
+        restored = 0
+        for step in sorted(keys, reverse=True):
+            entry = self._entries.get(keys[step])
+            if entry is None:
+                continue
+
+            self._entries.move_to_end(keys[step])
+            stack, memory = entry
+            interpreter.stack = list(stack)
+            interpreter.data_memory = memory.fork()
+            interpreter.pc = step
+            restored = step
+            break
+
+        if restored:
+            self.hits += 1
+            self.skipped_steps += restored
+        else:
+            self.misses += 1
+
+        return restored, {step: (key, step <= shared_until) for step, key in keys.items() if step > restored}
+
+    def store(self, key, interpreter, shared=False):
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            return
+
+        # Общие префиксы попадают в горячий конец, уникальный хвост программы - в холодный,
+        # чтобы хвостовые состояния вытесняли друг друга, а не общую преамбулу
+        self._entries[key] = (tuple(interpreter.stack), interpreter.snapshot_memory())
+        if not shared:
+            self._entries.move_to_end(key, last=False)
+        if len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def report(self):
+        print(f"Кэш префиксов: попаданий {self.hits} из {self.hits + self.misses} "
+              f"({self.hit_rate():.0%}), пропущено шагов: {self.skipped_steps}")
+
+    def stats(self):
+        return {
+            'entries': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hit_rate(),
+            'skipped_steps': self.skipped_steps
+        }
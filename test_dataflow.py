@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+import contextlib
+import io
+import os
+import random
+import tempfile
+import unittest
+
+from assembler import UVMAssembler
+from dataflow import DataflowExecutor
+from interpreter import UVMInterpreter
+
+
+def random_program(rng, length, cells, allow_errors=False):
+    lines = []
+    depth = 0
+
+    for _ in range(length):
+        if allow_errors and rng.random() < 0.01:
+            lines.append(f"READ_MEM {rng.randrange(cells, 2048)}")
+        elif (depth or allow_errors) and rng.random() < 0.5:
+            lines.append(f"WRITE_MEM {rng.randrange(cells)}")
+            depth -= 1
+        else:
+            mnemonic = rng.choice(['LOAD_CONST', 'READ_MEM', 'SGN'])
+            operand = rng.randrange(-50, 50) if mnemonic == 'LOAD_CONST' else rng.randrange(cells)
+            lines.append(f"{mnemonic} {operand}")
+            depth += 1
+
+    assembler = UVMAssembler()
+    assembler.assemble('\n'.join(lines))
+    return assembler.to_bytes()
+
+
+class DataflowEquivalenceTest(unittest.TestCase):
+    def setUp(self):
+        handle, self.binary_file = tempfile.mkstemp(suffix='.bin')
+        os.close(handle)
+
+    def tearDown(self):
+        os.remove(self.binary_file)
+
+    def assert_same_as_run(self, binary_data, memory_size, max_steps, **options):
+        with open(self.binary_file, 'wb') as f:
+            f.write(binary_data)
+
+        reference = UVMInterpreter(memory_size)
+        executor = DataflowExecutor(UVMInterpreter(memory_size), min_parallel_steps=0, **options)
+
+        reference_output = io.StringIO()
+        with contextlib.redirect_stdout(reference_output):
+            expected = reference.run(self.binary_file, None, max_steps=max_steps)
+        executor_output = io.StringIO()
+        with contextlib.redirect_stdout(executor_output):
+            result = executor.run(self.binary_file, None, max_steps=max_steps)
+
+        self.assertEqual(result, expected)
+        self.assertEqual(executor.interpreter.data_memory, reference.data_memory)
+        self.assertEqual(executor.interpreter.stack, reference.stack)
+        self.assertEqual(executor.interpreter.pc, reference.pc)
+
+        # Итоговые сообщения (ошибка, лимит шагов) совпадают с последовательным выполнением
+        self.assertEqual(executor_output.getvalue().splitlines()[-2:],
+                         reference_output.getvalue().splitlines()[-2:])
+
+    def test_random_programs_in_process(self):
+        rng = random.Random(1)
+        for case in range(200):
+            binary_data = random_program(rng, rng.randrange(1, 400), 30, allow_errors=case % 3 == 0)
+            max_steps = 1000 if case % 5 else rng.randrange(1, 100)
+            with self.subTest(case=case):
+                self.assert_same_as_run(binary_data, 64, max_steps, workers=1, segments_per_worker=7)
+
+    def test_random_programs_in_worker_processes(self):
+        rng = random.Random(2)
+        for case in range(4):
+            binary_data = random_program(rng, 5000, 200, allow_errors=case == 3)
+            with self.subTest(case=case):
+                self.assert_same_as_run(binary_data, 2048, 10 ** 6, workers=3)
+
+    def test_unknown_opcode_stops_at_same_step(self):
+        binary_data = random_program(random.Random(3), 50, 10) + b'\x01\x00\x00'
+        self.assert_same_as_run(binary_data, 64, 1000, workers=1, segments_per_worker=4)
+
+
+if __name__ == "__main__":
+    unittest.main()
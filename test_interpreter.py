@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+import contextlib
+import io
+import random
+import unittest
+
+from assembler import UVMAssembler
+from interpreter import UVMInterpreter
+from test_dataflow import random_program
+
+
+class LifecycleTracer:
+    def __init__(self, test):
+        self.test = test
+        self.active = False
+        self.sessions = 0
+
+    def start(self, interpreter):
+        self.test.assertFalse(self.active, "трасса запущена повторно без finish()")
+        self.active = True
+        self.sessions += 1
+
+    def record(self, pc, opcode, operand, address, old_value):
+        self.test.assertTrue(self.active)
+
+    def finish(self):
+        self.active = False
+
+
+def reference_stops(binary_data, memory_size, breakpoints, watchpoints, stack_conditions):
+    # Эталон: условия остановки проверяются после каждого шага обычного выполнения
+    interpreter = UVMInterpreter(memory_size)
+    with contextlib.redirect_stdout(io.StringIO()):
+        interpreter.load_bytes(binary_data)
+
+    stops = {}
+    while interpreter.pc < len(interpreter.code_memory):
+        pc = interpreter.pc
+        if pc in breakpoints:
+            stops.setdefault(pc, []).append(f"точка останова PC={pc}")
+
+        instruction = interpreter.decode_instruction(interpreter.code_memory[pc])
+        interpreter.execute_instruction(instruction, verbose=False)
+        interpreter.pc += 1
+
+        if instruction['opcode'] == 7 and instruction['operand'] in watchpoints:
+            stops.setdefault(pc + 1, []).append(f"запись в ячейку {instruction['operand']} (PC={pc})")
+        if len(interpreter.stack) in stack_conditions:
+            stops.setdefault(pc + 1, []).append(f"глубина стека {len(interpreter.stack)} (PC={pc})")
+
+    return stops, interpreter
+
+
+def debug_session(interpreter, limit=None):
+    stops = {}
+    reasons = interpreter.debug_start()
+    if reasons:
+        stops[interpreter.pc] = reasons
+
+    while not interpreter.debug_finished() and (limit is None or len(stops) < limit):
+        reasons = interpreter.debug_continue()
+        if reasons:
+            stops[interpreter.pc] = reasons
+
+    return stops
+
+
+class DebugStopsTest(unittest.TestCase):
+    def random_case(self, rng):
+        binary_data = random_program(rng, rng.randrange(1, 200), 20)
+        count = len(binary_data) // 3
+        breakpoints = set(rng.sample(range(count), min(count, rng.randrange(4))))
+        watchpoints = set(rng.sample(range(20), rng.randrange(3)))
+        stack_conditions = set(rng.sample(range(6), rng.randrange(3)))
+        return binary_data, breakpoints, watchpoints, stack_conditions
+
+    def create_interpreter(self, binary_data, breakpoints, watchpoints, stack_conditions):
+        interpreter = UVMInterpreter(64, tracer=LifecycleTracer(self))
+        with contextlib.redirect_stdout(io.StringIO()):
+            interpreter.load_bytes(binary_data)
+        for pc in breakpoints:
+            interpreter.add_breakpoint(pc)
+        for address in watchpoints:
+            interpreter.add_watchpoint(address)
+        for depth in stack_conditions:
+            interpreter.add_stack_condition(depth)
+        return interpreter
+
+    def assert_same_as_reference(self, interpreter, stops, expected_stops, reference):
+        self.assertEqual(stops, expected_stops)
+        self.assertEqual(interpreter.data_memory, reference.data_memory)
+        self.assertEqual(interpreter.stack, reference.stack)
+        self.assertFalse(interpreter.tracer.active)
+
+    def test_stops_match_per_step_checks(self):
+        rng = random.Random(4)
+        for case in range(200):
+            binary_data, *conditions = self.random_case(rng)
+            with self.subTest(case=case):
+                expected_stops, reference = reference_stops(binary_data, 64, *conditions)
+                interpreter = self.create_interpreter(binary_data, *conditions)
+                stops = debug_session(interpreter)
+                self.assert_same_as_reference(interpreter, stops, expected_stops, reference)
+
+    def test_restart_mid_session(self):
+        rng = random.Random(5)
+        for case in range(200):
+            binary_data, *conditions = self.random_case(rng)
+            with self.subTest(case=case):
+                expected_stops, reference = reference_stops(binary_data, 64, *conditions)
+                interpreter = self.create_interpreter(binary_data, *conditions)
+
+                # Первый сеанс прерывается на одной из остановок, второй идет с начала программы
+                debug_session(interpreter, limit=rng.randrange(1, 4))
+                stops = debug_session(interpreter)
+                self.assert_same_as_reference(interpreter, stops, expected_stops, reference)
+                self.assertEqual(interpreter.tracer.sessions, 2)
+
+    def test_restart_after_stack_condition(self):
+        interpreter = UVMInterpreter(16)
+        assembler = UVMAssembler()
+        assembler.assemble("LOAD_CONST 1\nLOAD_CONST 5\nWRITE_MEM 3\nLOAD_CONST 7")
+        with contextlib.redirect_stdout(io.StringIO()):
+            interpreter.load_bytes(assembler.to_bytes())
+        interpreter.add_stack_condition(2)
+
+        interpreter.debug_start()
+        self.assertEqual(interpreter.debug_continue(), ["глубина стека 2 (PC=1)"])
+
+        interpreter.debug_start()
+        self.assertEqual(interpreter.stack, [])
+        self.assertEqual(interpreter.debug_continue(), ["глубина стека 2 (PC=1)"])
+        self.assertEqual(interpreter.stack, [1, 5])
+        self.assertEqual(interpreter.debug_continue(), ["глубина стека 2 (PC=3)"])
+        self.assertEqual(interpreter.stack, [1, 7])
+        self.assertEqual(interpreter.data_memory[3], 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+import random
+import unittest
+
+from paged_memory import PagedMemory, memory_is_clean, memory_pages
+
+
+class PagedMemoryForkTest(unittest.TestCase):
+    def assert_matches(self, memory, model):
+        self.assertEqual(len(memory), len(model))
+        self.assertEqual(memory.to_list(), model)
+        self.assertEqual(list(memory_pages(memory, memory.page_size)),
+                         list(memory_pages(model, memory.page_size)))
+        self.assertEqual(memory.is_clean(), memory_is_clean(model))
+
+    def test_parent_child_grandchild_isolation(self):
+        parent = PagedMemory(1000)
+        parent[5] = 1
+        parent[999] = 2
+
+        child = parent.fork()
+        grandchild = child.fork()
+        self.assertEqual(child.owned_pages(), 0)
+        self.assertEqual(grandchild.owned_pages(), 0)
+
+        parent[5] = 10
+        child[999] = 20
+        grandchild[500] = 30
+
+        self.assertEqual((parent[5], parent[500], parent[999]), (10, 0, 2))
+        self.assertEqual((child[5], child[500], child[999]), (1, 0, 20))
+        self.assertEqual((grandchild[5], grandchild[500], grandchild[999]), (1, 30, 2))
+        self.assertEqual(grandchild.owned_pages(), 1)
+
+        # Повторное ветвление после записей видит текущее состояние, а не состояние первой копии
+        sibling = parent.fork()
+        parent[5] = 100
+        self.assertEqual((sibling[5], sibling[999]), (10, 2))
+        self.assertEqual(child[5], 1)
+
+    def test_random_fork_trees(self):
+        rng = random.Random(11)
+        for case in range(40):
+            size = rng.choice([1, 63, 64, 65, 1000, 2048])
+            page_size = rng.choice([1, 7, 64, 100])
+            values = [rng.randrange(-5, 5) if rng.random() < 0.1 else 0 for _ in range(size)]
+
+            memories = [PagedMemory.from_list(values, page_size)]
+            models = [list(values)]
+            with self.subTest(case=case, size=size, page_size=page_size):
+                for _ in range(200):
+                    index = rng.randrange(len(memories))
+                    if rng.random() < 0.15:
+                        memories.append(memories[index].fork())
+                        models.append(list(models[index]))
+                    else:
+                        address = rng.randrange(-size, size)
+                        value = rng.randrange(-1000, 1000)
+                        memories[index][address] = value
+                        models[index][address] = value
+
+                    # Запись в одну копию не видна ни в родителе, ни в потомках, ни в соседях
+                    for memory, model in zip(memories, models):
+                        self.assertEqual(memory.to_list(), model)
+
+                for memory, model in zip(memories, models):
+                    self.assert_matches(memory, model)
+
+    def test_out_of_range(self):
+        memory = PagedMemory(100, 64)
+        child = memory.fork()
+        for address in (100, -101):
+            with self.assertRaises(IndexError):
+                child[address] = 1
+            with self.assertRaises(IndexError):
+                child[address]
+        self.assertEqual(memory.to_list(), [0] * 100)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+import contextlib
+import io
+import random
+import unittest
+
+from assembler import UVMAssembler
+from interpreter import UVMInterpreter
+from prefix_cache import PrefixCache
+from test_dataflow import random_program
+
+
+def execute(binary_data, memory_size, max_steps, prefix_cache=None):
+    interpreter = UVMInterpreter(memory_size, prefix_cache=prefix_cache)
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        interpreter.load_bytes(binary_data)
+        result = interpreter.execute(None, max_steps=max_steps)
+
+    # Пошаговый вывод восстановленного префикса пропускается, а строки кэша есть только
+    # у кэшированного запуска: сравниваются итоговые сообщения (ошибка, лимит шагов)
+    lines = [line for line in output.getvalue().splitlines() if 'кэш' not in line.lower()]
+    return result, interpreter, lines[-2:]
+
+
+def preamble_program(preamble_length, tail, cells=20):
+    lines = []
+    for step in range(preamble_length):
+        lines.append(f"LOAD_CONST {step}" if step % 2 == 0 else f"WRITE_MEM {step % cells}")
+    return lines + tail
+
+
+class PrefixCacheEquivalenceTest(unittest.TestCase):
+    def assert_same_as_uncached(self, binary_data, memory_size, max_steps, cache):
+        expected, reference, reference_lines = execute(binary_data, memory_size, max_steps)
+        result, interpreter, lines = execute(binary_data, memory_size, max_steps, cache)
+
+        self.assertEqual(result, expected)
+        self.assertEqual(interpreter.data_memory, reference.data_memory)
+        self.assertEqual(interpreter.stack, reference.stack)
+        self.assertEqual(interpreter.pc, reference.pc)
+        self.assertEqual(lines, reference_lines)
+
+    def test_random_program_families(self):
+        rng = random.Random(7)
+        for family in range(20):
+            cache = PrefixCache(capacity=rng.randrange(1, 12), interval=rng.randrange(1, 40))
+            preamble = random_program(rng, rng.randrange(0, 300), 30)
+
+            for case in range(10):
+                # Варианты: общая преамбула, случайный хвост (иногда с ошибкой), разный лимит шагов
+                binary_data = preamble + random_program(rng, rng.randrange(0, 200), 30,
+                                                        allow_errors=case % 4 == 3)
+                max_steps = 1000 if case % 3 else rng.randrange(1, 400)
+                with self.subTest(family=family, case=case):
+                    self.assert_same_as_uncached(binary_data, 64, max_steps, cache)
+
+    def test_repeated_program_is_restored(self):
+        binary_data = random_program(random.Random(8), 500, 30)
+        cache = PrefixCache(capacity=4, interval=64)
+
+        for _ in range(3):
+            self.assert_same_as_uncached(binary_data, 64, 1000, cache)
+        self.assertEqual(cache.hits, 2)
+
+    def test_shared_preamble_survives_tail_states(self):
+        # Хвостовые состояния каждого варианта вытесняют друг друга, а не общую преамбулу
+        cache = PrefixCache(capacity=8, interval=7)
+        skipped = []
+        for variant in range(4):
+            tail = [f"LOAD_CONST {variant * 100 + step}" for step in range(50)]
+            assembler = UVMAssembler()
+            assembler.assemble('\n'.join(preamble_program(100, tail)))
+            before = cache.skipped_steps
+            with self.subTest(variant=variant):
+                self.assert_same_as_uncached(assembler.to_bytes(), 64, 1000, cache)
+            skipped.append(cache.skipped_steps - before)
+
+        self.assertEqual(cache.hits, 3)
+        self.assertEqual(cache.misses, 1)
+        # Первый запуск еще не знает общего префикса и успевает сохранить только первые
+        # состояния; со второго общая часть (до шага 98) уже в горячем конце
+        self.assertEqual(skipped, [0, 56, 98, 98])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+import contextlib
+import io
+import os
+import random
+import tempfile
+import unittest
+
+from interpreter import UVMInterpreter
+from test_dataflow import random_program
+from uvm_trace import TraceReader, TraceRecorder, checkpoint_path
+
+
+def reference_states(binary_data, memory_size):
+    # Эталон: состояние после каждого шага обычного пошагового выполнения
+    interpreter = UVMInterpreter(memory_size)
+    with contextlib.redirect_stdout(io.StringIO()):
+        interpreter.load_bytes(binary_data)
+
+    states = [(list(interpreter.data_memory), list(interpreter.stack))]
+    while interpreter.pc < len(interpreter.code_memory):
+        try:
+            instruction = interpreter.decode_instruction(interpreter.code_memory[interpreter.pc])
+            interpreter.execute_instruction(instruction, verbose=False)
+        except ValueError:
+            break
+        interpreter.pc += 1
+        states.append((list(interpreter.data_memory), list(interpreter.stack)))
+
+    return states
+
+
+def traced_run(binary_data, memory_size, recorder):
+    interpreter = UVMInterpreter(memory_size, recorder)
+    with contextlib.redirect_stdout(io.StringIO()):
+        interpreter.load_bytes(binary_data)
+        interpreter.execute(None, max_steps=10 ** 6)
+
+
+class TraceStateTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.trace_file = os.path.join(self.directory.name, 'trace.bin')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def assert_states(self, reader, states, first_step=0):
+        self.assertEqual(len(reader), len(states) - 1)
+        self.assertEqual(reader.first_step, first_step)
+
+        # Шаги между контрольными точками восстанавливаются и вперед, и откатом по old_value
+        for step in range(first_step, len(states)):
+            self.assertEqual(reader.state_at(step), states[step], f"шаг {step}")
+
+        if first_step:
+            with self.assertRaises(IndexError):
+                reader.state_at(first_step - 1)
+        with self.assertRaises(IndexError):
+            reader.state_at(len(states))
+
+    def test_file_trace(self):
+        rng = random.Random(9)
+        for case in range(6):
+            binary_data = random_program(rng, rng.randrange(1, 1500), 20, allow_errors=case % 2 == 1)
+            states = reference_states(binary_data, 64)
+            with self.subTest(case=case):
+                traced_run(binary_data, 64, TraceRecorder(self.trace_file, checkpoint_interval=rng.randrange(1, 200),
+                                                          buffer_size=rng.randrange(1, 4096)))
+                self.assertTrue(os.path.exists(checkpoint_path(self.trace_file)))
+                self.assert_states(TraceReader(self.trace_file), states)
+
+    def test_ring_buffer_trace(self):
+        rng = random.Random(10)
+        for case in range(6):
+            binary_data = random_program(rng, rng.randrange(200, 1500), 20, allow_errors=case % 2 == 1)
+            states = reference_states(binary_data, 64)
+            capacity = rng.randrange(50, 150)
+            interval = rng.randrange(1, 60)
+            with self.subTest(case=case):
+                # Емкость меньше числа шагов: старые записи и контрольные точки вытесняются
+                recorder = TraceRecorder(capacity=capacity, checkpoint_interval=interval)
+                traced_run(binary_data, 64, recorder)
+                self.assertLessEqual(len(recorder.checkpoints), capacity // interval + 2)
+                first_step = max(0, len(states) - 1 - capacity)
+                self.assert_states(TraceReader.from_recorder(recorder), states, first_step)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+import sys
+import argparse
+import os
+
+from interpreter import positive_int
+
+
+def read_source(input_file):
+    with open(input_file, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def assemble_source(source_code, test_mode=False):
+    from assembler import UVMAssembler
+
+    assembler = UVMAssembler()
+    assembler.assemble(source_code)
+
+    if test_mode:
+        assembler.display_intermediate()
+        print("\nБинарное представление:")
+
+    return assembler, assembler.to_bytes(test_mode)
+
+
+def command_asm(args):
+    if args.jobs is not None:
+        from assembler import UVMAssembler
+
+        count = UVMAssembler().assemble_file_parallel(args.input_file, args.output_file, args.jobs or None)
+        print(f"\nУспешно ассемблировано {count} команд")
+        return True
+
+    assembler, binary_data = assemble_source(read_source(args.input_file), args.test)
+
+    with open(args.output_file, 'wb') as f:
+        f.write(binary_data)
+
+    print(f"\nУспешно ассемблировано {len(assembler.instructions)} команд")
+    return True
+
+
+def create_tracer(args):
+    if not args.trace:
+        return None
+
+    from uvm_trace import TraceRecorder
+    return TraceRecorder(args.trace, checkpoint_interval=args.trace_interval)
+
+
+def create_executor(args):
+    from interpreter import UVMInterpreter
+
+    interpreter = UVMInterpreter(args.memory_size, create_tracer(args))
+    interpreter.digest_page_size = args.digest_page_size
+    if args.workers is None:
+        return interpreter
+
+    if args.trace:
+        raise ValueError("Трассировка недоступна при параллельном выполнении")
+
+    from dataflow import DataflowExecutor
+    return DataflowExecutor(interpreter, args.workers or None)
+
+
+def command_run(args):
+    from interpreter import parse_range
+
+    executor = create_executor(args)
+    return executor.run(args.binary_file, args.memory_dump, parse_range(args.range),
+                        args.max_steps, args.digest)
+
+
+def command_exec(args):
+    from interpreter import parse_range
+
+    dump_range = parse_range(args.range)
+    _, binary_data = assemble_source(read_source(args.input_file))
+
+    # Байты передаются интерпретатору напрямую, без промежуточного .bin файла
+    executor = create_executor(args)
+    executor.load_bytes(binary_data)
+    return executor.execute(args.memory_dump, dump_range, args.max_steps, args.digest)
+
+
+def command_batch(args):
+    from interpreter import UVMInterpreter
+    from prefix_cache import PrefixCache
+
+    # Варианты с общей преамбулой выполняются с общим кэшем префиксов
+    cache = PrefixCache(args.cache_size, args.cache_interval)
+    if args.digest_dir:
+        os.makedirs(args.digest_dir, exist_ok=True)
+
+    success = True
+    for input_file in args.input_files:
+        _, binary_data = assemble_source(read_source(input_file))
+
+        interpreter = UVMInterpreter(args.memory_size, prefix_cache=cache)
+        interpreter.digest_page_size = args.digest_page_size
+        interpreter.load_bytes(binary_data)
+
+        digest_file = None
+        if args.digest_dir:
+            name = os.path.splitext(os.path.basename(input_file))[0]
+            digest_file = os.path.join(args.digest_dir, name + '.json')
+
+        success = interpreter.execute(None, max_steps=args.max_steps, digest_file=digest_file) and success
+
+    print(f"\nПрограмм выполнено: {len(args.input_files)}")
+    cache.report()
+    return success
+
+
+def command_gui(args):
+    import uvm_gui
+
+    uvm_gui.main()
+    return True
+
+
+def add_execution_arguments(parser):
+    parser.add_argument('memory_dump', nargs='?', help='Путь к файлу для дампа памяти')
+    parser.add_argument('--range', help='Диапазон адресов для дампа (формат: start-end или address)')
+    parser.add_argument('--max-steps', type=int, default=1000, help='Максимальное количество шагов выполнения')
+    parser.add_argument('--memory-size', type=int, default=2048, help='Размер памяти данных')
+    parser.add_argument('--digest', help='Путь к файлу для дайджеста памяти (хэш-дерево по страницам)')
+    parser.add_argument('--digest-page-size', type=positive_int, help='Размер страницы дайджеста в ячейках (по умолчанию 64)')
+    parser.add_argument('--trace', help='Путь к файлу для бинарной трассы выполнения')
+    parser.add_argument('--workers', type=int, nargs='?', const=0,
+                        help='Параллельное выполнение по независимым срезам памяти (0 - по числу ядер)')
+    parser.add_argument('--trace-interval', type=int, default=4096, help='Интервал контрольных точек трассы в шагах')
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='uvm', description='Учебная Виртуальная Машина')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    asm_parser = subparsers.add_parser('asm', help='Ассемблировать программу в двоичный файл')
+    asm_parser.add_argument('input_file', help='Путь к исходному файлу')
+    asm_parser.add_argument('output_file', help='Путь к двоичному файлу-результату')
+    asm_parser.add_argument('--test', action='store_true', help='Режим тестирования')
+    asm_parser.add_argument('--jobs', type=int, nargs='?', const=0,
+                            help='Параллельное ассемблирование фрагментами (0 - по числу ядер)')
+    asm_parser.set_defaults(handler=command_asm)
+
+    run_parser = subparsers.add_parser('run', help='Выполнить двоичный файл')
+    run_parser.add_argument('binary_file', help='Путь к бинарному файлу с программой')
+    add_execution_arguments(run_parser)
+    run_parser.set_defaults(handler=command_run)
+
+    exec_parser = subparsers.add_parser('exec', help='Ассемблировать и выполнить в одном процессе')
+    exec_parser.add_argument('input_file', help='Путь к исходному файлу')
+    add_execution_arguments(exec_parser)
+    exec_parser.set_defaults(handler=command_exec)
+
+    batch_parser = subparsers.add_parser('batch', help='Выполнить набор программ с общим кэшем префиксов')
+    batch_parser.add_argument('input_files', nargs='+', help='Пути к исходным файлам')
+    batch_parser.add_argument('--digest-dir', help='Папка для дайджестов памяти (<имя программы>.json)')
+    batch_parser.add_argument('--digest-page-size', type=positive_int, help='Размер страницы дайджеста в ячейках (по умолчанию 64)')
+    batch_parser.add_argument('--max-steps', type=int, default=1000, help='Максимальное количество шагов выполнения')
+    batch_parser.add_argument('--memory-size', type=int, default=2048, help='Размер памяти данных')
+    batch_parser.add_argument('--cache-size', type=int, default=256, help='Емкость кэша префиксов (состояний)')
+    batch_parser.add_argument('--cache-interval', type=int, default=1024, help='Интервал сохранения состояний в шагах')
+    batch_parser.set_defaults(handler=command_batch)
+
+    gui_parser = subparsers.add_parser('gui', help='Запустить графический интерфейс')
+    gui_parser.set_defaults(handler=command_gui)
+
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    if args.command in ('run', 'exec') and not args.memory_dump and not args.digest:
+        parser.error("укажите файл дампа памяти и/или --digest")
+    if args.command == 'asm' and args.jobs is not None and args.test:
+        parser.error("--jobs несовместим с --test")
+
+    try:
+        if not args.handler(args):
+            sys.exit(1)
+
+    except Exception as e:
+        print(f"Ошибка: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -93,6 +93,36 @@ class UVMGUI:
         self.end_addr.insert(0, "300")
         self.end_addr.grid(row=0, column=4)
 
+        debug_frame = ttk.Frame(control_frame)
+        debug_frame.grid(row=2, column=0, sticky=(tk.W, tk.E), pady=(10, 0))
+
+        ttk.Label(debug_frame, text="Останов (PC):").grid(row=0, column=0, padx=(0, 5))
+        self.breakpoints_entry = ttk.Entry(debug_frame, width=10)
+        self.breakpoints_entry.grid(row=0, column=1, padx=(0, 10))
+
+        ttk.Label(debug_frame, text="Запись в:").grid(row=0, column=2, padx=(0, 5))
+        self.watchpoints_entry = ttk.Entry(debug_frame, width=10)
+        self.watchpoints_entry.grid(row=0, column=3, padx=(0, 10))
+
+        ttk.Label(debug_frame, text="Глубина стека:").grid(row=0, column=4, padx=(0, 5))
+        self.stack_depth_entry = ttk.Entry(debug_frame, width=5)
+        self.stack_depth_entry.grid(row=0, column=5)
+
+        debug_buttons = ttk.Frame(control_frame)
+        debug_buttons.grid(row=3, column=0, sticky=(tk.W, tk.E), pady=(10, 0))
+
+        debug_button = ttk.Button(debug_buttons, text="🐞 Отладка", command=self.debug_program)
+        debug_button.grid(row=0, column=0, padx=(0, 10))
+
+        continue_button = ttk.Button(debug_buttons, text="⏭ Продолжить", command=self.debug_continue)
+        continue_button.grid(row=0, column=1, padx=(0, 10))
+
+        step_button = ttk.Button(debug_buttons, text="↪ Шаг", command=self.debug_step)
+        step_button.grid(row=0, column=2)
+
+        self.debugger = None
+        self.debug_running = False
+
         self.output_text = scrolledtext.ScrolledText(output_frame, height=15, font=("Courier New", 9))
         self.output_text.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
 
@@ -179,6 +209,113 @@ WRITE_MEM 203"""
         thread.daemon = True
         thread.start()
 
+    def parse_numbers(self, entry):
+        return [int(item) for item in entry.get().replace(',', ' ').split()]
+
+    def debug_program(self):
+        import io
+        import contextlib
+
+        if self.debug_running:
+            self.status_var.set("Отладка выполняется...")
+            return
+
+        try:
+            source_code = self.code_editor.get(1.0, tk.END)
+            self.assembler.assemble(source_code)
+
+            self.debugger = UVMInterpreter()
+            for pc in self.parse_numbers(self.breakpoints_entry):
+                self.debugger.add_breakpoint(pc)
+            for address in self.parse_numbers(self.watchpoints_entry):
+                self.debugger.add_watchpoint(address)
+            for depth in self.parse_numbers(self.stack_depth_entry):
+                self.debugger.add_stack_condition(depth)
+
+            output_buffer = io.StringIO()
+            with contextlib.redirect_stdout(output_buffer):
+                self.debugger.load_bytes(self.assembler.to_bytes())
+                reasons = self.debugger.debug_start()
+
+            self.output_text.delete(1.0, tk.END)
+            self.output_text.insert(1.0, output_buffer.getvalue())
+            self.show_debug_state(reasons)
+
+        except Exception as e:
+            self.debugger = None
+            self.output_text.delete(1.0, tk.END)
+            self.output_text.insert(1.0, f"ОШИБКА: {str(e)}")
+            self.status_var.set("Ошибка отладки")
+
+    def debug_continue(self):
+        self.debug_action(lambda debugger: debugger.debug_continue())
+
+    def debug_step(self):
+        self.debug_action(lambda debugger: debugger.debug_step())
+
+    def debug_action(self, action):
+        if self.debug_running:
+            self.status_var.set("Отладка выполняется...")
+            return
+
+        if self.debugger is None:
+            self.status_var.set("Сначала запустите отладку")
+            return
+
+        if self.debugger.debug_finished():
+            self.status_var.set("Программа завершена")
+            return
+
+        def thread_target():
+            import io
+            import contextlib
+
+            debugger = self.debugger
+            try:
+                output_buffer = io.StringIO()
+                with contextlib.redirect_stdout(output_buffer):
+                    reasons = action(debugger)
+                self.output_text.insert(tk.END, output_buffer.getvalue())
+                self.show_debug_state(reasons)
+
+            except Exception as e:
+                self.output_text.insert(tk.END, f"\nОШИБКА ВЫПОЛНЕНИЯ на PC={debugger.pc}: {e}\n")
+                self.status_var.set("Ошибка выполнения")
+                self.debugger = None
+
+            finally:
+                self.debug_running = False
+
+        # Перемотка до следующей остановки может быть долгой - выполняется вне потока интерфейса
+        self.debug_running = True
+        self.status_var.set("Выполнение до следующей остановки...")
+        thread = threading.Thread(target=thread_target)
+        thread.daemon = True
+        thread.start()
+
+    def show_debug_state(self, reasons):
+        debugger = self.debugger
+
+        try:
+            start_addr = int(self.start_addr.get())
+            end_addr = int(self.end_addr.get())
+        except ValueError:
+            start_addr, end_addr = 0, 300
+
+        if reasons:
+            self.output_text.insert(tk.END, f"\nОСТАНОВ: {'; '.join(reasons)}\n")
+        elif debugger.debug_finished():
+            self.output_text.insert(tk.END, "\nПрограмма завершена\n")
+
+        self.output_text.insert(tk.END, f"PC: {debugger.pc} | Стек: {debugger.stack}\n")
+        for addr in range(max(start_addr, 0), min(end_addr, len(debugger.data_memory))):
+            value = debugger.data_memory[addr]
+            if value != 0:
+                self.output_text.insert(tk.END, f"[{addr}] = {value}\n")
+
+        self.output_text.see(tk.END)
+        self.status_var.set(f"Отладка: PC={debugger.pc}")
+
     def clear_output(self):
         self.output_text.delete(1.0, tk.END)
         self.status_var.set("Вывод очищен")
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+import sys
+import argparse
+import os
+import struct
+from collections import namedtuple
+from itertools import chain
+
+from paged_memory import memory_pages
+
+MAGIC = b'UVMT'
+VERSION = 1
+
+# Заголовок файла трассы: сигнатура, версия, размер памяти данных
+HEADER = struct.Struct('<4sHI')
+# Запись трассы: pc, код операции, операнд, адрес записи (-1 - нет записи), старое значение
+RECORD = struct.Struct('<IBhhi')
+# Заголовок контрольной точки: номер шага, размер памяти, глубина стека
+CHECKPOINT = struct.Struct('<QII')
+
+TraceRecord = namedtuple('TraceRecord', ['pc', 'opcode', 'operand', 'address', 'old_value'])
+
+
+def checkpoint_path(filename):
+    return filename + '.ckpt'
+
+
+class TraceRecorder:
+    def __init__(self, filename=None, capacity=None, checkpoint_interval=4096, buffer_size=1 << 16):
+        if (filename is None) == (capacity is None):
+            raise ValueError("Укажите либо файл трассы, либо емкость кольцевого буфера")
+        if checkpoint_interval <= 0:
+            raise ValueError("Интервал контрольных точек должен быть положительным")
+
+        self.filename = filename
+        self.capacity = capacity
+        self.checkpoint_interval = checkpoint_interval
+        self.buffer_size = buffer_size
+        self.memory_size = 0
+        self.steps = 0
+        self.checkpoints = []
+        self.interpreter = None
+        self._file = None
+        self._checkpoint_file = None
+        self._ring = None
+
+    def start(self, interpreter):
+        self.interpreter = interpreter
+        self.memory_size = len(interpreter.data_memory)
+        self.steps = 0
+        self.checkpoints = []
+
+        if self.filename:
+            self._file = open(self.filename, 'wb', buffering=self.buffer_size)
+            self._file.write(HEADER.pack(MAGIC, VERSION, self.memory_size))
+            self._checkpoint_file = open(checkpoint_path(self.filename), 'wb', buffering=self.buffer_size)
+        else:
+            self._ring = bytearray(self.capacity * RECORD.size)
+
+        self.checkpoint()
+
+    def record(self, pc, opcode, operand, address, old_value):
+        if self._file:
+            self._file.write(RECORD.pack(pc, opcode, operand, address, old_value))
+        else:
+            RECORD.pack_into(self._ring, (self.steps % self.capacity) * RECORD.size,
+                             pc, opcode, operand, address, old_value)
+
+        self.steps += 1
+        if self.steps % self.checkpoint_interval == 0:
+            self.checkpoint()
+
+    def checkpoint(self):
+        memory = self.interpreter.data_memory
+        stack = self.interpreter.stack
+
+        if self._checkpoint_file:
+            self._checkpoint_file.write(CHECKPOINT.pack(self.steps, len(memory), len(stack)))
+            for page in memory_pages(memory):
+                self._checkpoint_file.write(struct.pack(f'<{len(page)}i', *page))
+            self._checkpoint_file.write(struct.pack(f'<{len(stack)}i', *stack))
+        else:
+            # В кольцевом буфере бесполезны точки старше самой ранней сохраненной записи
+            oldest = self.first_step()
+            self.checkpoints = [cp for cp in self.checkpoints if cp[0] >= oldest]
+            self.checkpoints.append((self.steps, list(chain.from_iterable(memory_pages(memory))), list(stack)))
+
+    def first_step(self):
+        if self.capacity is None:
+            return 0
+        return max(0, self.steps - self.capacity)
+
+    def finish(self):
+        if self.interpreter is None:
+            return
+
+        if self.steps % self.checkpoint_interval != 0:
+            self.checkpoint()
+
+        if self._file:
+            self._file.close()
+            self._checkpoint_file.close()
+            self._file = None
+            self._checkpoint_file = None
+
+        self.interpreter = None
+
+
+class TraceReader:
+    def __init__(self, filename=None, recorder=None):
+        if (filename is None) == (recorder is None):
+            raise ValueError("Укажите либо файл трассы, либо объект записи")
+
+        self.filename = filename
+        self._recorder = recorder
+        self._checkpoint_index = []
+
+        if filename:
+            with open(filename, 'rb') as f:
+                magic, version, self.memory_size = HEADER.unpack(f.read(HEADER.size))
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"Файл {filename} не является трассой УВМ")
+
+            self.steps = (os.path.getsize(filename) - HEADER.size) // RECORD.size
+            self.first_step = 0
+            self._index_checkpoints()
+        else:
+            self.memory_size = recorder.memory_size
+            self.steps = recorder.steps
+            self.first_step = recorder.first_step()
+            self._checkpoint_index = [cp[0] for cp in recorder.checkpoints]
+
+    @classmethod
+    def from_recorder(cls, recorder):
+        return cls(recorder=recorder)
+
+    def __len__(self):
+        return self.steps
+
+    def _index_checkpoints(self):
+        # Индекс контрольных точек: номер шага и смещение в файле, данные читаются по запросу
+        self._checkpoint_offsets = []
+        path = checkpoint_path(self.filename)
+        size = os.path.getsize(path)
+
+        with open(path, 'rb') as f:
+            offset = 0
+            while offset < size:
+                f.seek(offset)
+                step, memory_len, stack_len = CHECKPOINT.unpack(f.read(CHECKPOINT.size))
+                self._checkpoint_index.append(step)
+                self._checkpoint_offsets.append(offset)
+                offset += CHECKPOINT.size + 4 * (memory_len + stack_len)
+
+    def _load_checkpoint(self, position):
+        if self._recorder:
+            step, memory, stack = self._recorder.checkpoints[position]
+            return list(memory), list(stack)
+
+        with open(checkpoint_path(self.filename), 'rb') as f:
+            f.seek(self._checkpoint_offsets[position])
+            step, memory_len, stack_len = CHECKPOINT.unpack(f.read(CHECKPOINT.size))
+            memory = list(struct.unpack(f'<{memory_len}i', f.read(4 * memory_len)))
+            stack = list(struct.unpack(f'<{stack_len}i', f.read(4 * stack_len)))
+        return memory, stack
+
+    def records(self, start, end):
+        if start < self.first_step or end > self.steps or start > end:
+            raise IndexError(f"Шаги {start}-{end} вне сохраненной трассы {self.first_step}-{self.steps}")
+
+        if self._recorder:
+            ring = self._recorder._ring
+            capacity = self._recorder.capacity
+            for step in range(start, end):
+                yield TraceRecord(*RECORD.unpack_from(ring, (step % capacity) * RECORD.size))
+            return
+
+        with open(self.filename, 'rb') as f:
+            f.seek(HEADER.size + start * RECORD.size)
+            data = f.read((end - start) * RECORD.size)
+        for fields in RECORD.iter_unpack(data):
+            yield TraceRecord(*fields)
+
+    def record(self, step):
+        return next(self.records(step, step + 1))
+
+    def state_at(self, step):
+        # Состояние перед выполнением шага step: ближайшая контрольная точка + воспроизведение
+        if step < self.first_step or step > self.steps:
+            raise IndexError(f"Шаг {step} вне сохраненной трассы {self.first_step}-{self.steps}")
+
+        usable = [i for i, cp_step in enumerate(self._checkpoint_index) if cp_step >= self.first_step]
+        if not usable:
+            raise ValueError("В трассе нет контрольных точек")
+
+        position = min(usable, key=lambda i: abs(self._checkpoint_index[i] - step))
+        cp_step = self._checkpoint_index[position]
+        memory, stack = self._load_checkpoint(position)
+
+        if cp_step <= step:
+            for rec in self.records(cp_step, step):
+                self._apply(rec, memory, stack)
+        else:
+            for rec in reversed(list(self.records(step, cp_step))):
+                self._undo(rec, memory, stack)
+
+        return memory, stack
+
+    @staticmethod
+    def _apply(rec, memory, stack):
+        opcode = rec.opcode
+        operand = rec.operand
+
+        if opcode == 14:  # LOAD_CONST
+            stack.append(operand)
+        elif opcode == 11:  # READ_MEM
+            stack.append(memory[operand])
+        elif opcode == 7:  # WRITE_MEM
+            memory[rec.address] = stack.pop()
+        elif opcode == 4:  # SGN
+            value = memory[operand]
+            stack.append(1 if value > 0 else -1 if value < 0 else 0)
+
+    @staticmethod
+    def _undo(rec, memory, stack):
+        if rec.opcode == 7:  # WRITE_MEM
+            stack.append(memory[rec.address])
+            memory[rec.address] = rec.old_value
+        else:
+            stack.pop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Просмотр бинарной трассы УВМ')
+    parser.add_argument('trace_file', help='Путь к файлу трассы')
+    parser.add_argument('--step', type=int, help='Номер шага для восстановления состояния (по умолчанию последний)')
+    parser.add_argument('--range', help='Диапазон адресов для вывода (формат: start-end или address)')
+
+    args = parser.parse_args()
+
+    try:
+        from interpreter import parse_range
+
+        reader = TraceReader(args.trace_file)
+        step = reader.steps if args.step is None else args.step
+        memory, stack = reader.state_at(step)
+
+        print(f"Шагов в трассе: {reader.steps}")
+        if step < reader.steps:
+            rec = reader.record(step)
+            print(f"Шаг {step}: PC={rec.pc} код={rec.opcode} операнд={rec.operand}")
+        print(f"Стек перед шагом {step}: {stack}")
+
+        start, end = parse_range(args.range) or (0, len(memory))
+        for addr in range(start, min(end, len(memory))):
+            if memory[addr] != 0:
+                print(f"[{addr}] = {memory[addr]}")
+
+    except Exception as e:
+        print(f"Ошибка: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()